@@ -1,3 +1,5 @@
 DESIRED_BREAK_TIME =        5 # Specify how long a break should be in minutes.
 DESIRED_DAILY_STUDY_TIME =  120 # The goal study time for each day (in minutes).
 IS_TESTING =                False # Determines whether the program should run in training mode or not.
+VERBOSE_TICK =              False # Prints a minute counter while a session runs (POSIX only).
+USE_UUID_IDS =              False # Generate RFC-4122 uuid4 session ids instead of raw random hex.
@@ -1,28 +1,124 @@
 #!/usr/bin/env python3
 
+import atexit
 import json
+import queue
+import signal
 import sys
+import threading
 import time
 import logging
 import sqlite3
-import traceback
-from datetime import date, datetime
+from logging.handlers import QueueHandler, QueueListener
+from datetime import date, datetime, timedelta
 from json.decoder import JSONDecodeError
 from pathlib import Path
-from typing import Tuple, Dict, Any, Optional, List
+from typing import Tuple, Dict, Any, Iterator, Optional, List
 from uuid import uuid4
 import re
 import os
-from dataclasses import dataclass
-from contextlib import contextmanager
+import dataclasses
+from dataclasses import dataclass, field
+from contextlib import closing, contextmanager
+
+import config
+
+# Optional fast JSON backend for the file-based log (falls back to stdlib json)
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    def _json_dumpline(data: Any) -> bytes:
+        # orjson serializes dataclasses natively, field by field
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_DATACLASS)
+
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    orjson = None
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    def _json_dumpline(data: Any) -> bytes:
+        if dataclasses.is_dataclass(data):
+            data = dataclasses.asdict(data)
+        # Compact separators to match orjson's output shape and keep the
+        # machine-read log lines small
+        return json.dumps(
+            data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    _JSONDecodeError = JSONDecodeError
+
+_today_cache: Tuple[float, str] = (0.0, "")
+
+def _today_str() -> str:
+    """Return today's ISO date string, re-deriving it only when the local day rolls over
+
+    The cache expires at the next local midnight rather than on the UTC
+    day number: the two roll over at different moments, and an overnight
+    session in a non-UTC timezone would otherwise keep yesterday's date
+    for hours. The fast path is still a single clock read and compare.
+    """
+    global _today_cache
+    if time.time() >= _today_cache[0]:
+        today = date.today()
+        next_midnight = datetime.combine(today + timedelta(days=1),
+                                         datetime.min.time())
+        _today_cache = (next_midnight.timestamp(), today.isoformat())
+    return _today_cache[1]
+
+def _new_session_id() -> str:
+    """Return a 32-hex-char random session id
+
+    os.urandom(16).hex() yields the same entropy and shape as uuid4().hex
+    without constructing a UUID object first; config.USE_UUID_IDS restores
+    RFC-4122 formatted ids for anyone who relies on them.
+    """
+    if config.USE_UUID_IDS:
+        return uuid4().hex
+    return os.urandom(16).hex()
 
 @dataclass
 class StudySession:
-    """Data class for study session parameters"""
+    """Data class for study session parameters
+
+    Instances built through from_raw are fully validated; downstream code
+    (logging, timers, serialization) trusts the fields as-is instead of
+    re-validating them at every layer.
+    """
     name: str
     repetitions: int
     minutes: int
     date: str
+    id: str = field(default_factory=_new_session_id)
+
+    @classmethod
+    def from_raw(cls, repetitions: Any, minutes: Any, subject: str,
+                 date_str: Optional[str] = None) -> "StudySession":
+        """Build a validated session from raw user-supplied values
+
+        Batch callers can pass a precomputed date_str to avoid re-deriving
+        today's date for every record.
+        """
+        repetitions = StudyTimer.validate_numeric_input(
+            repetitions, SecurityConfig.MAX_REPETITIONS, "Repetitions")
+        minutes = StudyTimer.validate_numeric_input(
+            minutes, SecurityConfig.MAX_MINUTES, "Minutes")
+        subject = StudyTimer.sanitize_input(subject)
+        if not subject:
+            subject = StudyTimer.DEFAULT_SUBJECT
+        if date_str is None:
+            date_str = _today_str()
+        return cls(name=subject, repetitions=repetitions,
+                   minutes=minutes, date=date_str)
 
 class SecurityConfig:
     """Security-related configuration settings"""
@@ -32,46 +128,89 @@ class SecurityConfig:
     MAX_FILE_SIZE = 10_000_000  # 10MB
     ALLOWED_CHARS = re.compile(r'^[a-zA-Z0-9\s\-_]+$')
 
+# Precompiled inverse of ALLOWED_CHARS, used to strip disallowed characters
+_STRIP_RE = re.compile(r'[^a-zA-Z0-9\s\-_]')
+
 class StudyTimer:
     """A secure study timer application supporting normal and pomodoro modes"""
     
     # Base paths and database
     BASE_DIR = Path(__file__).parent.resolve()
     DB_PATH = BASE_DIR / "study_timer.db"
+    LOGGING_FILE = BASE_DIR / "logfile.jsonl"
     
     # Application defaults
     DEFAULT_REPETITIONS = 3
     DEFAULT_MINUTES = 30
     DEFAULT_SUBJECT = "Unspecified"
+
+    # User-facing text
+    WELCOME_MESSAGE = "Welcome! It's time to study."
+    CONTROL_VARIABLES_PROMPT = (
+        'Enter the number of reps, the length for each rep, and the subject you are studying.\n'
+        'Repetitions,minutes,subject: ')
     
     # Pomodoro settings
     POMODORO_SESSION_LENGTH = 25  # minutes
     POMODORO_BREAK_TIME = 5  # minutes
 
+    # Cached database connection, created lazily and shared per process
+    _conn: Optional[sqlite3.Connection] = None
+
+    # Long-lived O_APPEND descriptors for the JSONL logs, keyed by path
+    _log_fds: Dict[str, int] = {}
+
+    # Queue feeding the background JSONL writer thread, started lazily
+    _file_log_queue: Optional[queue.Queue] = None
+
+    # Parsed history per log path; appends update it in place so repeat
+    # readers skip the re-parse entirely. The mtime recorded alongside each
+    # entry detects appends from other processes — a stat is far cheaper
+    # than re-parsing the file just in case
+    _history_cache: Dict[str, List[Dict[str, Any]]] = {}
+    _history_cache_mtime: Dict[str, int] = {}
+
+    # Crash-recovery state for the session currently being timed
+    _active_session: Optional["StudySession"] = None
+    _session_deadline: float = 0.0
+    _flush_hooks_installed = False
+    _file_log_shutdown_installed = False
+
+    @classmethod
+    def _get_connection(cls) -> sqlite3.Connection:
+        """Return the shared database connection, opening it on first use"""
+        if cls._conn is None:
+            cls._conn = sqlite3.connect(
+                cls.DB_PATH,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            cls._conn.row_factory = sqlite3.Row
+            atexit.register(cls._conn.close)
+        return cls._conn
+
     @staticmethod
     @contextmanager
     def get_db_connection():
-        """Secure database connection context manager"""
-        conn = None
+        """Secure database transaction context manager over the cached connection"""
+        conn = StudyTimer._get_connection()
+        conn.execute("BEGIN")
         try:
-            conn = sqlite3.connect(StudyTimer.DB_PATH)
-            conn.row_factory = sqlite3.Row
             yield conn
-            conn.commit()
-        except Exception as e:
-            if conn:
-                conn.rollback()
+            conn.execute("COMMIT")
+        except BaseException:
+            # BaseException, not Exception: pomodoro mode uses Ctrl-C as
+            # normal control flow, and a KeyboardInterrupt that lands inside
+            # a transaction must not leave the shared connection wedged
+            conn.execute("ROLLBACK")
             raise
-        finally:
-            if conn:
-                conn.close()
 
     @classmethod
     def setup_database(cls):
         """Initialize database tables"""
         create_sessions_table = """
         CREATE TABLE IF NOT EXISTS study_sessions (
-            id TEXT PRIMARY KEY,
+            id BLOB PRIMARY KEY,
             name TEXT NOT NULL,
             repetitions INTEGER NOT NULL,
             minutes INTEGER NOT NULL,
@@ -96,39 +235,145 @@ class StudyTimer:
             repetitions INTEGER NOT NULL,
             minutes INTEGER NOT NULL
         );
+        INSERT OR IGNORE INTO temp_sessions (id, name, repetitions, minutes)
+            VALUES (1, '', 0, 0);
+        """
+
+        # Let get_study_history/get_runtime_logs walk an index instead of
+        # sorting the whole table on every call
+        create_indexes = """
+        CREATE INDEX IF NOT EXISTS idx_sessions_created
+            ON study_sessions(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_logs_ts
+            ON runtime_logs(timestamp DESC);
         """
         
-        with cls.get_db_connection() as conn:
-            conn.execute(create_sessions_table)
-            conn.execute(create_runtime_logs_table)
-            conn.execute(create_temp_sessions_table)
+        # One executescript call: a single prepared batch instead of three
+        # round-trips, with WAL + NORMAL sync amortizing later write costs
+        pragmas = """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        """
+
+        cls._get_connection().executescript(
+            pragmas
+            + create_sessions_table
+            + create_runtime_logs_table
+            + create_temp_sessions_table
+            + create_indexes
+        )
+
+    class _BatchDBHandler(logging.Handler):
+        """Logging handler that batches runtime log inserts into SQLite
+
+        Records are buffered in memory and flushed with a single
+        executemany/commit once BATCH_SIZE records accumulate or
+        FLUSH_INTERVAL elapses, so the countdown loops never pay a
+        per-record connection + fsync cost.
+        """
+
+        BATCH_SIZE = 64
+        FLUSH_INTERVAL = 0.5  # seconds
+
+        def __init__(self):
+            super().__init__()
+            self._buffer: List[Tuple[str, str]] = []
+            self._buffer_lock = threading.Lock()
+            self._flush_timer: Optional[threading.Timer] = None
+            self._conn = sqlite3.connect(
+                StudyTimer.DB_PATH,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            self._conn.executescript(
+                "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
 
-    class DatabaseHandler(logging.Handler):
-        """Custom logging handler for SQLite database"""
         def emit(self, record):
             try:
-                with StudyTimer.get_db_connection() as conn:
-                    conn.execute(
-                        "INSERT INTO runtime_logs (level, message, timestamp) VALUES (?, ?, ?)",
-                        (record.levelname, record.getMessage(), datetime.now())
-                    )
+                with self._buffer_lock:
+                    # The timestamp column defaults to CURRENT_TIMESTAMP, so
+                    # no per-record datetime object is built here
+                    self._buffer.append((record.levelname, record.getMessage()))
+                    if len(self._buffer) >= self.BATCH_SIZE:
+                        self._flush_locked()
+                    elif self._flush_timer is None:
+                        self._flush_timer = threading.Timer(
+                            self.FLUSH_INTERVAL, self.flush)
+                        self._flush_timer.daemon = True
+                        self._flush_timer.start()
             except Exception:
                 self.handleError(record)
+
+        def _flush_locked(self):
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._buffer:
+                return
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO runtime_logs (level, message) VALUES (?, ?)",
+                    self._buffer)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._buffer.clear()
+
+        def flush(self):
+            with self._buffer_lock:
+                self._flush_locked()
+
+        def close(self):
+            self.flush()
+            self._conn.close()
+            super().close()
+
     @classmethod
     def setup_logging(cls) -> None:
-        """Configure logging with database handler"""
+        """Configure logging with a queued, batching database handler"""
         # Create and initialize the database
         cls.setup_database()
-        
+
+        # Log records go through a queue so the timer thread only pays a
+        # queue.put; the listener thread owns the database and stderr I/O.
+        log_queue: queue.Queue = queue.Queue(-1)
+        db_handler = cls._BatchDBHandler()
+        # Keep console output for warnings and errors only; routine INFO
+        # records go to the database, and user feedback goes through print()
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setLevel(logging.WARNING)
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s'))
+        cls._log_listener = QueueListener(
+            log_queue,
+            # Database handler for all logs
+            db_handler,
+            stream_handler,
+            respect_handler_level=True
+        )
+        cls._log_listener.start()
+
+        def _shutdown_logging():
+            # Drain the queue, then flush any still-buffered batch so no
+            # records are lost on exit
+            cls._log_listener.stop()
+            db_handler.close()
+
+        atexit.register(_shutdown_logging)
+
+        # The QueueHandler must not render timestamp or level:
+        # QueueHandler.prepare() bakes its formatter's output into
+        # record.msg, which would store both a second time in the message
+        # column. It gets an explicit message-only formatter (basicConfig
+        # would otherwise hand it BASIC_FORMAT); the stderr handler above
+        # carries the human-readable format instead
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                # Database handler for all logs
-                cls.DatabaseHandler(),
-                # Keep console output for errors only
-                logging.StreamHandler(sys.stderr)
-            ]
+            handlers=[queue_handler]
         )
 
     @staticmethod
@@ -136,8 +381,11 @@ class StudyTimer:
         """Sanitize string input to prevent injection attacks"""
         if not value:
             return ""
+        # Fast path: input that is already clean needs no rebuilding
+        if SecurityConfig.ALLOWED_CHARS.match(value):
+            return value[:SecurityConfig.MAX_SUBJECT_LENGTH]
         # Remove any potentially dangerous characters
-        sanitized = re.sub(r'[^a-zA-Z0-9\s\-_]', '', value)
+        sanitized = _STRIP_RE.sub('', value)
         return sanitized[:SecurityConfig.MAX_SUBJECT_LENGTH]
 
     @staticmethod
@@ -153,179 +401,537 @@ class StudyTimer:
             raise ValueError(f"{name} must be between 1 and {max_value}")
 
     @classmethod
-    def ask_user_for_control_variables(cls) -> Tuple[int, int, str]:
+    def ask_user_for_control_variables(cls) -> StudySession:
         """Get and validate study session parameters from user input"""
-        prompt = ('Enter the number of reps, the length for each rep, and the subject you are studying.\n'
-                 'Repetitions,minutes,subject: ')
+        user_input = input(cls.CONTROL_VARIABLES_PROMPT).strip()
+        parts = [part.strip() for part in user_input.split(',', 2)]
 
-        try:
-            user_input = input(prompt).strip()
-            if not user_input:
-                raise ValueError("Empty input")
-
-            parts = [part.strip() for part in user_input.split(',')]
-            if len(parts) != 3:
-                raise ValueError("Invalid input format")
-
-            repetitions = cls.validate_numeric_input(
-                parts[0], 
-                SecurityConfig.MAX_REPETITIONS,
-                "Repetitions"
-            )
-            minutes = cls.validate_numeric_input(
-                parts[1],
-                SecurityConfig.MAX_MINUTES,
-                "Minutes"
-            )
-            subject = cls.sanitize_input(parts[2])
-
-            if not subject:
-                subject = cls.DEFAULT_SUBJECT
-
-            return (repetitions, minutes, subject)
+        # Explicit checks instead of exception-driven control flow; malformed
+        # input is the common failure and should not build a traceback
+        if len(parts) == 3 and parts[0].isdigit() and parts[1].isdigit():
+            try:
+                return StudySession.from_raw(parts[0], parts[1], parts[2])
+            except ValueError as e:
+                # Out-of-range values still surface through the validators
+                logging.warning(f"Invalid input provided: {str(e)}")
+        else:
+            logging.warning("Invalid input format provided")
 
-        except (ValueError, IndexError) as e:
-            logging.warning(f"Invalid input provided: {str(e)}")
-            return (cls.DEFAULT_REPETITIONS, cls.DEFAULT_MINUTES, cls.DEFAULT_SUBJECT)
+        return StudySession.from_raw(
+            cls.DEFAULT_REPETITIONS, cls.DEFAULT_MINUTES, cls.DEFAULT_SUBJECT)
 
     @classmethod
-    def log_info(cls, information_tuple: Tuple[int, int, str], 
+    def log_info(cls, session: StudySession,
                  is_temporary: bool = False) -> None:
-        """Log study session information to database"""
+        """Log a validated study session to the database"""
         try:
-            repetitions, minutes, subject = information_tuple
-            
-            # Validate inputs
-            repetitions = cls.validate_numeric_input(
-                repetitions, SecurityConfig.MAX_REPETITIONS, "Repetitions")
-            minutes = cls.validate_numeric_input(
-                minutes, SecurityConfig.MAX_MINUTES, "Minutes")
-            subject = cls.sanitize_input(subject)
-            
             # Only log permanent sessions (not temporary crash recovery)
             if not is_temporary:
                 with cls.get_db_connection() as conn:
                     conn.execute("""
                         INSERT INTO study_sessions (id, name, repetitions, minutes, date)
                         VALUES (?, ?, ?, ?, ?)
-                    """, (str(uuid4()), subject, repetitions, minutes, str(date.today())))
-                    logging.info(f"Successfully logged study session for {subject}")
-            
-            # For temporary crash recovery, store in temp_sessions table
+                    """, (bytes.fromhex(session.id), session.name,
+                          session.repetitions, session.minutes, session.date))
+                    logging.info(f"Successfully logged study session for {session.name}")
+
+            # For temporary crash recovery, update the row seeded by
+            # setup_database in place (INSERT OR REPLACE would delete and
+            # reinsert it on every write)
             else:
                 with cls.get_db_connection() as conn:
                     conn.execute("""
-                        INSERT OR REPLACE INTO temp_sessions (id, name, repetitions, minutes)
-                        VALUES (1, ?, ?, ?)
-                    """, (subject, repetitions, minutes))
-                    
-        except Exception as e:
-            logging.error(f"Failed to log study session: {type(e).__name__}")
+                        UPDATE temp_sessions SET name = ?, repetitions = ?, minutes = ?
+                        WHERE id = 1
+                    """, (session.name, session.repetitions, session.minutes))
+
+        except Exception:
+            logging.exception("Failed to log study session")
             raise
+
     @classmethod
-    def run_normal_mode(cls, repetitions: int, minutes: int, 
-                       subject: str, break_time: int) -> None:
+    def log_info_batch(cls, sessions: List[StudySession]) -> None:
+        """Log many validated study sessions in a single transaction"""
+        if not sessions:
+            return
+        try:
+            with cls.get_db_connection() as conn:
+                conn.executemany("""
+                    INSERT INTO study_sessions (id, name, repetitions, minutes, date)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(bytes.fromhex(s.id), s.name, s.repetitions,
+                       s.minutes, s.date) for s in sessions])
+            logging.info(f"Successfully logged {len(sessions)} study sessions")
+        except Exception:
+            logging.exception("Failed to log study session batch")
+            raise
+
+    @staticmethod
+    def _sleep_until(deadline: float) -> None:
+        """Sleep in a single call until the given monotonic deadline
+
+        With config.VERBOSE_TICK enabled, a kernel interval timer prints a
+        minute counter while the one blocking sleep runs, instead of the
+        timer thread waking up every 60 seconds itself.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if not (config.VERBOSE_TICK and hasattr(signal, "setitimer")):
+            time.sleep(remaining)
+            return
+
+        # Precompute every progress frame once per segment; the handler only
+        # indexes and writes, doing no formatting on the wakeup path. Each
+        # frame starts with \r so the line updates in place instead of
+        # scrolling the terminal, and the write/flush callables are bound
+        # once instead of looked up per tick
+        # Round rather than truncate: a hair of clock time has already
+        # elapsed since the caller computed the deadline, and flooring
+        # would drop the final minute from the bar
+        total = int(remaining / 60 + 0.5)
+        ticks = [
+            f"\r[{'#' * k}{'.' * (total - k)}] {k}/{total}"
+            for k in range(1, total + 1)
+        ]
+        minute = 0
+        _write = sys.stdout.write
+        _flush = sys.stdout.flush
+
+        def _tick(signum, frame):
+            nonlocal minute
+            if minute < len(ticks):
+                _write(ticks[minute])
+                _flush()
+            minute += 1
+
+        try:
+            previous = signal.signal(signal.SIGALRM, _tick)
+        except ValueError:
+            # Not on the main thread; fall back to the plain sleep
+            time.sleep(remaining)
+            return
+        signal.setitimer(signal.ITIMER_REAL, 60, 60)
+        try:
+            # Each tick interrupts the sleep; PEP 475 resumes it with the
+            # remaining time, so this stays a single blocking call
+            time.sleep(remaining)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0, 0)
+            signal.signal(signal.SIGALRM, previous)
+            print(flush=True)
+
+    @classmethod
+    def _flush_temp_session(cls) -> None:
+        """Persist the remaining minutes of an in-flight session for crash recovery"""
+        if cls._active_session is None:
+            return
+        session = cls._active_session
+        remaining_seconds = max(0.0, cls._session_deadline - time.monotonic())
+        remaining_minutes = max(1, int((remaining_seconds + 59) // 60))
+        try:
+            cls.log_info(
+                StudySession(session.name, session.repetitions,
+                             remaining_minutes, session.date),
+                is_temporary=True)
+        except Exception:
+            logging.error("Failed to flush crash recovery state")
+
+    @classmethod
+    def _install_flush_hooks(cls) -> None:
+        """Flush crash-recovery state when the process exits or is terminated"""
+        if cls._flush_hooks_installed:
+            return
+        cls._flush_hooks_installed = True
+        atexit.register(cls._flush_temp_session)
+
+        def _on_sigterm(signum, frame):
+            cls._flush_temp_session()
+            sys.exit(1)
+
+        try:
+            signal.signal(signal.SIGTERM, _on_sigterm)
+        except (ValueError, OSError):
+            # Not on the main thread (or unsupported); atexit still covers us
+            pass
+
+    @classmethod
+    def run_normal_mode(cls, session: StudySession, break_time: int) -> None:
         """Run normal study mode with database logging"""
         try:
-            repetitions = cls.validate_numeric_input(
-                repetitions, SecurityConfig.MAX_REPETITIONS, "Repetitions")
-            minutes = cls.validate_numeric_input(
-                minutes, SecurityConfig.MAX_MINUTES, "Minutes")
             break_time = cls.validate_numeric_input(
                 break_time, SecurityConfig.MAX_MINUTES, "Break time")
-            subject = cls.sanitize_input(subject)
+            repetitions, minutes = session.repetitions, session.minutes
 
             logging.info(f'Starting study session: {minutes} minute(s), '
-                        f'{repetitions} time(s), Subject: {subject}')
-            
+                        f'{repetitions} time(s), Subject: {session.name}')
+
+            # Flatten the session/break alternation into a schedule computed
+            # once up front (no break after the last session)
+            schedule: List[Tuple[str, int]] = []
             for i in range(repetitions):
-                logging.info(f"Session {i + 1} of {repetitions}")
-                
-                # Session countdown
-                for minute in range(minutes, 0, -1):
-                    logging.info(f"Minutes remaining: {minute}")
-                    # Log temporary progress
-                    cls.log_info((repetitions - i, minute, subject), is_temporary=True)
-                    time.sleep(60)
-                
-                if i < repetitions - 1:  # No break after last session
-                    logging.info(f"Break time: {break_time} minutes")
-                    # Break countdown
-                    for minute in range(break_time, 0, -1):
-                        logging.info(f"Break minutes remaining: {minute}")
-                        time.sleep(60)
+                schedule.append(("study", repetitions - i))
+                if i < repetitions - 1:
+                    schedule.append(("break", break_time))
+
+            # Bind the loop dependencies to locals once instead of doing
+            # attribute lookups on every iteration
+            log = logging.info
+            monotonic = time.monotonic
+            sleep_until = cls._sleep_until
+            log_temp = cls.log_info
+            cls._install_flush_hooks()
+
+            for kind, value in schedule:
+                if kind == "study":
+                    log(f"Session {repetitions - value + 1} of {repetitions}")
+
+                    # Record crash-recovery progress once, then sleep through
+                    # the whole session in a single call
+                    cls._active_session = StudySession(
+                        session.name, value, minutes, session.date)
+                    cls._session_deadline = monotonic() + minutes * 60
+                    log_temp(cls._active_session, is_temporary=True)
+                    sleep_until(cls._session_deadline)
+                    cls._active_session = None
+                else:
+                    log(f"Break time: {value} minutes")
+                    sleep_until(monotonic() + value * 60)
 
         except ValueError as e:
             logging.error(f"Invalid parameters for normal mode: {str(e)}")
             raise
 
     @classmethod
-    def run_pomodoro_mode(cls) -> Tuple[int, int, str]:
+    def run_pomodoro_mode(cls) -> StudySession:
         """Run pomodoro mode with database logging"""
         try:
             session_count = 0
             while True:
                 logging.info(f"Pomodoro session {session_count + 1}")
-                
-                for minute in range(cls.POMODORO_SESSION_LENGTH, 0, -1):
-                    logging.info(f"Minutes remaining: {minute}")
-                    # Log temporary progress
-                    cls.log_info((session_count + 1, minute, "Pomodoro"), is_temporary=True)
-                    time.sleep(60)
-                
+
+                # Record crash-recovery progress once, then sleep through the
+                # whole session in a single call instead of waking every minute
+                cls._active_session = StudySession(
+                    "Pomodoro", session_count + 1,
+                    cls.POMODORO_SESSION_LENGTH, _today_str())
+                cls._session_deadline = (
+                    time.monotonic() + cls.POMODORO_SESSION_LENGTH * 60)
+                cls._install_flush_hooks()
+                cls.log_info(cls._active_session, is_temporary=True)
+                cls._sleep_until(cls._session_deadline)
+                cls._active_session = None
+
                 session_count += 1
                 logging.info(f"Break time: {cls.POMODORO_BREAK_TIME} minutes")
-                
-                # Break countdown
-                for minute in range(cls.POMODORO_BREAK_TIME, 0, -1):
-                    logging.info(f"Break minutes remaining: {minute}")
-                    time.sleep(60)
+                cls._sleep_until(time.monotonic() + cls.POMODORO_BREAK_TIME * 60)
 
         except KeyboardInterrupt:
             logging.info(f"Pomodoro mode ended after {session_count} sessions")
-            return (session_count, cls.POMODORO_SESSION_LENGTH, "Pomodoro")
+            return StudySession("Pomodoro", session_count,
+                                cls.POMODORO_SESSION_LENGTH, _today_str())
+
+    @classmethod
+    def get_study_history(cls) -> Iterator[Dict]:
+        """Yield study session history records lazily, newest first
+
+        Plain SELECTs run outside get_db_connection on purpose: an explicit
+        transaction held across the yields would stay open if the caller
+        abandons the iterator, wedging the shared connection.
+        """
+        with closing(cls._get_connection().execute("""
+            SELECT * FROM study_sessions
+            ORDER BY created_at DESC
+        """)) as cursor:
+            for row in cursor:
+                record = dict(row)
+                # Ids are stored as 16-byte blobs; expose them as hex
+                if isinstance(record["id"], bytes):
+                    record["id"] = record["id"].hex()
+                yield record
+
+    @classmethod
+    def get_runtime_logs(cls, limit: int = 100) -> Iterator[Dict]:
+        """Yield recent runtime logs lazily, newest first"""
+        with closing(cls._get_connection().execute("""
+            SELECT * FROM runtime_logs
+            ORDER BY timestamp DESC
+            LIMIT ?
+        """, (limit,))) as cursor:
+            for row in cursor:
+                yield dict(row)
+
+    @classmethod
+    def validate_file_path(cls, filepath: Path) -> bool:
+        """Ensure file operations stay inside the application directory
+
+        BASE_DIR is already resolved at import time, so a lexical
+        comparison against it avoids re-stat'ing the whole path ancestry
+        on every file operation.
+        """
+        return os.path.dirname(os.path.abspath(filepath)) == str(cls.BASE_DIR)
+
+    @classmethod
+    def safe_file_read(cls, filepath: Path) -> Dict[str, Any]:
+        """Securely read the JSON log file, returning an empty dict if absent"""
+        filepath = Path(filepath)
+        if not cls.validate_file_path(filepath):
+            raise ValueError(f"Invalid file path: {filepath}")
+        if not filepath.exists():
+            return {}
+        size = filepath.stat().st_size
+        if size == 0:
+            # Empty file: nothing to parse, so skip the decode-error detour
+            return {}
+        if size > SecurityConfig.MAX_FILE_SIZE:
+            raise ValueError("Log file exceeds maximum allowed size")
+        try:
+            return _json_loads(filepath.read_bytes())
+        except _JSONDecodeError:
+            logging.warning(f"Corrupt log file detected: {filepath}")
+            return {}
+
+    @classmethod
+    def safe_file_write(cls, filepath: Path, data: Dict[str, Any]) -> None:
+        """Securely rewrite a whole JSON log document (full-dict writes only;
+        session appends go through format_user_input_to_json)"""
+        filepath = Path(filepath)
+        if not cls.validate_file_path(filepath):
+            raise ValueError(f"Invalid file path: {filepath}")
+        # Write the document to a sibling temp file and rename it into
+        # place: os.replace is atomic, so a crash mid-write leaves the old
+        # document intact instead of a torn one. The 0o600 mode still only
+        # applies at creation
+        tmp_path = filepath.with_name(filepath.name + ".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(_json_dumps(data))
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
     @classmethod
-    def get_study_history(cls) -> List[Dict]:
-        """Retrieve study session history"""
-        with cls.get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM study_sessions 
-                ORDER BY created_at DESC
-            """)
-            return [dict(row) for row in cursor.fetchall()]
+    def format_user_input_to_json(cls, session: StudySession,
+                                  filename: Optional[Path] = None) -> StudySession:
+        """Log a validated study session to the JSON log file (file-based
+        alternative to the SQLite store)"""
+        filename = Path(filename) if filename else cls.LOGGING_FILE
+        if not cls.validate_file_path(filename):
+            raise ValueError(f"Invalid file path: {filename}")
+        # The dataclass is serialized directly; no intermediate dict rebuild.
+        # The caller only enqueues; the writer thread owns the actual I/O
+        cls._ensure_file_log_worker()
+        cls._file_log_queue.put((filename, _json_dumpline(session) + b"\n"))
+
+        cached = cls._history_cache.get(str(filename))
+        if cached is not None:
+            cached.append(dataclasses.asdict(session))
+        return session
 
     @classmethod
-    def get_runtime_logs(cls, limit: int = 100) -> List[Dict]:
-        """Retrieve recent runtime logs"""
-        with cls.get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM runtime_logs 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+    def _ensure_file_log_worker(cls) -> None:
+        """Start the background JSONL writer thread on first use
+
+        The shared shutdown hook joins the queue so every enqueued record
+        is on disk before the process exits.
+        """
+        if cls._file_log_queue is None:
+            cls._file_log_queue = queue.Queue()
+            threading.Thread(target=cls._file_log_worker,
+                             name="jsonl-log-writer", daemon=True).start()
+            cls._install_file_log_shutdown()
+
+    @classmethod
+    def _install_file_log_shutdown(cls) -> None:
+        """Register the one shutdown hook for the JSONL log machinery
+
+        A single hook keeps the ordering right regardless of which part of
+        the machinery came up first: atexit runs callbacks LIFO, so separate
+        registrations could close an append descriptor before the queue
+        join had drained the records destined for it.
+        """
+        if cls._file_log_shutdown_installed:
+            return
+        cls._file_log_shutdown_installed = True
+
+        def _shutdown_file_log():
+            if cls._file_log_queue is not None:
+                cls._file_log_queue.join()
+            for fd in cls._log_fds.values():
+                os.close(fd)
+            cls._log_fds.clear()
+
+        atexit.register(_shutdown_file_log)
+
+    @classmethod
+    def _file_log_worker(cls) -> None:
+        """Drain queued log records, coalescing them into one write per file"""
+        log_queue = cls._file_log_queue
+        while True:
+            items = [log_queue.get()]
+            try:
+                while True:
+                    items.append(log_queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            batches: Dict[Path, bytearray] = {}
+            for filename, line in items:
+                batches.setdefault(filename, bytearray()).extend(line)
+            try:
+                for filename, buf in batches.items():
+                    fd = cls._get_log_fd(filename)
+                    os.write(fd, bytes(buf))
+                    # Our own appends must not look like a foreign writer
+                    cls._history_cache_mtime[str(filename)] = \
+                        os.fstat(fd).st_mtime_ns
+            except Exception:
+                logging.exception("Failed to write queued log records")
+            finally:
+                for _ in items:
+                    log_queue.task_done()
+
+    @classmethod
+    def migrate_legacy_logfile(cls, legacy_path: Optional[Path] = None,
+                               filename: Optional[Path] = None) -> int:
+        """One-shot migration of the old dict-shaped logfile.json to JSONL
+
+        Reads the legacy document once, appends its records as JSON lines,
+        and renames the old file so the migration never runs twice. Returns
+        the number of records migrated.
+        """
+        legacy_path = (Path(legacy_path) if legacy_path
+                       else cls.BASE_DIR / "logfile.json")
+        filename = Path(filename) if filename else cls.LOGGING_FILE
+        if not legacy_path.exists():
+            return 0
+
+        legacy_logs = cls.safe_file_read(legacy_path)
+        lines = bytearray()
+        for unique_id, record in legacy_logs.items():
+            record = dict(record)
+            record.setdefault("id", unique_id.replace("-", ""))
+            lines += _json_dumpline(record) + b"\n"
+        if lines:
+            os.write(cls._get_log_fd(filename), bytes(lines))
+            cls._history_cache.pop(str(filename), None)
+            cls._history_cache_mtime.pop(str(filename), None)
+        legacy_path.rename(legacy_path.with_suffix(".json.migrated"))
+        logging.info(f"Migrated {len(legacy_logs)} legacy log records to JSONL")
+        return len(legacy_logs)
+
+    @classmethod
+    def _get_log_fd(cls, filename: Path) -> int:
+        """Return a long-lived append descriptor for the given JSONL log"""
+        key = str(filename)
+        fd = cls._log_fds.get(key)
+        if fd is None:
+            fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            cls._log_fds[key] = fd
+            cls._install_file_log_shutdown()
+        return fd
+
+    @classmethod
+    def read_history(cls, filename: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+        """Yield study sessions lazily from the JSON-lines log file"""
+        filename = Path(filename) if filename else cls.LOGGING_FILE
+        if not cls.validate_file_path(filename):
+            raise ValueError(f"Invalid file path: {filename}")
+        key = str(filename)
+        cached = cls._history_cache.get(key)
+        if cached is not None:
+            try:
+                mtime = filename.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime == cls._history_cache_mtime.get(key):
+                yield from cached
+                return
+            # Another process appended since the cache was built; re-read
+            cls._history_cache.pop(key, None)
+        # Cold read: let any queued appends land first
+        if cls._file_log_queue is not None:
+            cls._file_log_queue.join()
+        if not filename.exists():
+            return
+        # Stat before reading so a write that races the parse invalidates
+        # the entry on the next access instead of going unnoticed
+        mtime = filename.stat().st_mtime_ns
+        records = []
+        with filename.open("rb") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = _json_loads(line)
+                except _JSONDecodeError:
+                    logging.warning(f"Skipping corrupt log line in {filename}")
+                    continue
+                records.append(record)
+                yield record
+        # Only a fully consumed read is a trustworthy snapshot to cache
+        cls._history_cache[key] = records
+        cls._history_cache_mtime[key] = mtime
 
     @classmethod
     def main(cls) -> None:
         """Main application entry point with secure execution"""
         cls.setup_logging()
         logging.info("Starting StudyTimer application")
+        cls.migrate_legacy_logfile()
 
         try:
-            print("Welcome! It's time to study.")
+            print(cls.WELCOME_MESSAGE)
             
-            # Handle CLI arguments
-            if len(sys.argv) == 4:
+            # Handle CLI arguments; any flag (or the legacy positional form)
+            # runs a session without touching stdin. argparse is only needed
+            # here, so it is not paid for at module import
+            import argparse
+            parser = argparse.ArgumentParser(
+                description="Run a study timer in normal or pomodoro mode")
+            parser.add_argument("session", nargs="*", metavar="ARG",
+                                help="legacy positional form: repetitions minutes subject")
+            parser.add_argument("--reps", type=int,
+                                help="number of repetitions")
+            parser.add_argument("--minutes", type=int,
+                                help="length of each repetition in minutes")
+            parser.add_argument("--subject",
+                                help="subject being studied")
+            parser.add_argument("--mode", choices=["normal", "pomodoro"],
+                                help="study mode (skips the interactive prompt)")
+            args = parser.parse_args()
+
+            def run_pomodoro() -> None:
+                result = cls.run_pomodoro_mode()
+                if result.repetitions > 0:
+                    cls.log_info(result)
+
+            def run_normal() -> None:
+                session = cls.ask_user_for_control_variables()
+                cls.log_info(session)
+                cls.run_normal_mode(session, cls.POMODORO_BREAK_TIME)
+
+            if args.mode == "pomodoro":
+                run_pomodoro()
+                return
+
+            scripted = (args.reps is not None or args.minutes is not None
+                        or args.subject is not None or args.mode == "normal")
+            if len(args.session) == 3 or scripted:
                 try:
-                    repetitions = cls.validate_numeric_input(
-                        sys.argv[1], SecurityConfig.MAX_REPETITIONS, "Repetitions")
-                    minutes = cls.validate_numeric_input(
-                        sys.argv[2], SecurityConfig.MAX_MINUTES, "Minutes")
-                    subject = cls.sanitize_input(sys.argv[3])
-                    
-                    cls.log_info((repetitions, minutes, subject))
-                    cls.run_normal_mode(repetitions, minutes, subject, cls.POMODORO_BREAK_TIME)
+                    if len(args.session) == 3:
+                        session = StudySession.from_raw(*args.session)
+                    else:
+                        session = StudySession.from_raw(
+                            args.reps if args.reps is not None else cls.DEFAULT_REPETITIONS,
+                            args.minutes if args.minutes is not None else cls.DEFAULT_MINUTES,
+                            args.subject or cls.DEFAULT_SUBJECT)
+
+                    cls.log_info(session)
+                    cls.run_normal_mode(session, cls.POMODORO_BREAK_TIME)
                     return
                 except ValueError as e:
                     logging.error(f"Invalid CLI arguments: {str(e)}")
@@ -335,13 +941,11 @@ class StudyTimer:
             print("\n1: Normal mode\n2: Pomodoro mode")
             mode = input("Choose your mode (1/2): ").strip()
 
-            if mode == "1":
-                user_input = cls.ask_user_for_control_variables()
-                cls.log_info(user_input)
-                cls.run_normal_mode(*user_input, cls.POMODORO_BREAK_TIME)
-            elif mode == "2":
-                result = cls.run_pomodoro_mode()
-                cls.log_info(result)
+            # Dict dispatch instead of an if/elif chain: one lookup no
+            # matter how many modes are added
+            handler = {"1": run_normal, "2": run_pomodoro}.get(mode)
+            if handler is not None:
+                handler()
             else:
                 logging.warning(f"Invalid mode selected: {mode}")
                 print("Invalid mode selected. Please try again.")
@@ -356,7 +960,39 @@ class StudyTimer:
         """Test method with secure execution"""
         cls.setup_logging()
         try:
-            cls.log_info((2, 2, "test"))
+            # In training mode, generate a batch of random sessions and write
+            # them in one transaction rather than one insert per session
+            if config.IS_TESTING:
+                # random is only needed in training mode, so it is not
+                # paid for at module import
+                from random import choice
+                subjects = ("math", "science", "history", "test")
+                today = _today_str()
+                sessions = [
+                    StudySession.from_raw(choice(range(1, 6)),
+                                          choice(range(5, 61)),
+                                          choice(subjects),
+                                          today)
+                    for _ in range(150)
+                ]
+                cls.log_info_batch(sessions)
+                # Exercise the JSONL path the same way. The test record is
+                # identical apart from its id, so it is encoded once and the
+                # unique id spliced into the bytes per copy — no per-record
+                # serialization in the loop
+                record = dataclasses.asdict(
+                    StudySession.from_raw(2, 2, "test", today))
+                record["id"] = "@id@"
+                template = _json_dumpline(record) + b"\n"
+                lines = bytearray()
+                for _ in range(150):
+                    lines += template.replace(b"@id@",
+                                              _new_session_id().encode())
+                os.write(cls._get_log_fd(cls.LOGGING_FILE), bytes(lines))
+                cls._history_cache.pop(str(cls.LOGGING_FILE), None)
+                cls._history_cache_mtime.pop(str(cls.LOGGING_FILE), None)
+            else:
+                cls.log_info(StudySession.from_raw(2, 2, "test"))
             logging.info("Test completed successfully")
         except Exception as e:
             logging.error(f"Test failed: {type(e).__name__}: {str(e)}")